@@ -2,21 +2,493 @@
 
 from __future__ import annotations
 
+import functools
 import json
 import os
+import queue
+import select
+import selectors
+import shutil
+import string
 import subprocess
-import tempfile
+import threading
 import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from herd_core.types import AgentRecord, AgentState, SpawnContext, SpawnResult
+# herd_core.types is imported where it is used so that importing the adapter
+# (e.g. from a freshly spawned CLI) does not pull in its dependency graph
+if TYPE_CHECKING:
+    from herd_core.types import AgentRecord, SpawnContext, SpawnResult
+
+# pidfds let the kernel report exits instead of polling each process (Linux 5.3+)
+_HAS_PIDFD = hasattr(os, "pidfd_open")
+
+# Most recent stream-json events kept per agent
+_MAX_EVENTS = 1000
+
+
+_PROMPT_TEMPLATE = """You are {role_title}, spawned to work on {ticket_id}.
+
+## YOUR IDENTITY
+{role_definition}
+
+## CRITICAL GIT RULES
+- NEVER push to main. NEVER run `git push origin main`.
+- ALL work goes on your feature branch. Push ONLY your branch: `git push -u origin {branch_name}`
+- Create a PR from your branch. The Architect merges. You NEVER merge or push to main.
+- NEVER merge PRs. You do NOT have merge authority. Submitting the PR is the end of your responsibility.
+
+## ENVIRONMENT
+{env_block}
+
+## WORKING DIRECTORY
+You are working in: {worktree_path}
+Branch: {branch_name}
+
+## ASSIGNMENT: {ticket_id}
+{assignment}
+
+{role_skeleton}"""
+
+# Tail of the prompt that only depends on the role's governance docs
+_ROLE_SKELETON_TEMPLATE = """## CRAFT STANDARDS
+{craft_standards}
+
+## PROJECT GUIDELINES
+{project_guidelines}
+{skills_block}
+
+START WORKING NOW.
+"""
+
+# _PROMPT_TEMPLATE as (literal, field) pairs with the literals already UTF-8
+# encoded, so the stdin payload only encodes the per-spawn fields
+_PROMPT_SEGMENTS = [
+    (literal.encode(), field)
+    for literal, field, _, _ in string.Formatter().parse(_PROMPT_TEMPLATE)
+]
+
+
+def _render_role_skeleton(
+    craft_standards: str, project_guidelines: str, skills: tuple[str, ...]
+) -> str:
+    """Render the role-constant tail of the prompt."""
+    skills_block = ""
+    if skills:
+        skills_block = "\n## SKILLS\n" + "\n".join(map("- {}".format, skills))
+    return _ROLE_SKELETON_TEMPLATE.format_map(
+        {
+            "craft_standards": craft_standards,
+            "project_guidelines": project_guidelines,
+            "skills_block": skills_block,
+        }
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _encode_role_skeleton(
+    craft_standards: str, project_guidelines: str, skills: tuple[str, ...]
+) -> bytes:
+    """Render the role-constant tail of the prompt as UTF-8.
+
+    A burst of spawns for one role passes equal governance strings each time.
+    When those are new str objects (contexts are usually rebuilt per ticket), a
+    lookup still hashes and compares the full text, which is linear in its
+    length. It skips the format() call, the concatenation of a fresh
+    multi-kilobyte string and its encoding.
+    """
+    return _render_role_skeleton(craft_standards, project_guidelines, skills).encode()
+
+
+class _WorktreePool:
+    """Background-filled pool of detached worktrees ready to be claimed.
+
+    `git worktree add` performs a full checkout, which dominates spawn latency
+    on large repositories. The pool pays that cost ahead of time on a daemon
+    thread so spawn() only has to name a branch and move the directory.
+    """
+
+    def __init__(
+        self,
+        repo_root: Path,
+        pool_root: Path,
+        depth: int,
+        git: str = "git",
+        lock: threading.Lock | None = None,
+    ) -> None:
+        """Start the refiller thread.
+
+        Args:
+            repo_root: Path to the main repository.
+            pool_root: Directory holding the pre-created worktrees.
+            depth: Number of worktrees to keep ready.
+            git: Git executable (default: git, resolved through PATH).
+            lock: Held while registering a worktree with git.
+        """
+        self.repo_root = repo_root
+        self.git = git
+        self.lock = lock or threading.Lock()
+        # Commit new pooled worktrees are cut from
+        self.start_point = "HEAD"
+        self.pool_root = pool_root
+        self.depth = depth
+        self._ready: queue.Queue[Path] = queue.Queue()
+        self._wanted = threading.Event()
+        self._closing = threading.Event()
+        self._thread = threading.Thread(
+            target=self._fill, name="herd-worktree-pool", daemon=True
+        )
+        self._thread.start()
+        self._wanted.set()
+
+    def take(self) -> Path | None:
+        """Pop a ready worktree without blocking and kick the refiller.
+
+        Returns:
+            Path to a detached worktree, or None if the pool is empty.
+        """
+        try:
+            path: Path | None = self._ready.get_nowait()
+        except queue.Empty:
+            path = None
+        self._wanted.set()
+        return path
+
+    def close(self) -> list[Path]:
+        """Stop the refiller thread.
+
+        Returns:
+            Worktrees that were still waiting in the pool.
+        """
+        self._closing.set()
+        self._wanted.set()
+        self._thread.join()
+        leftover = []
+        while not self._ready.empty():
+            leftover.append(self._ready.get_nowait())
+        return leftover
+
+    def _fill(self) -> None:
+        """Refill the pool to its target depth whenever kicked."""
+        while True:
+            self._wanted.wait()
+            self._wanted.clear()
+            while self._ready.qsize() < self.depth:
+                if self._closing.is_set():
+                    return
+                path = self.pool_root / uuid.uuid4().hex
+                with self.lock:
+                    result = subprocess.run(
+                        [
+                            self.git,
+                            "worktree",
+                            "add",
+                            "--no-checkout",
+                            "--detach",
+                            str(path),
+                            self.start_point,
+                        ],
+                        cwd=str(self.repo_root),
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                    )
+                if result.returncode == 0:
+                    # The checkout itself runs outside the lock
+                    result = subprocess.run(
+                        [self.git, "checkout"],
+                        cwd=str(path),
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                    )
+                    if result.returncode != 0:
+                        with self.lock:
+                            subprocess.run(
+                                [self.git, "worktree", "remove", str(path), "--force"],
+                                cwd=str(self.repo_root),
+                                stdout=subprocess.DEVNULL,
+                                stderr=subprocess.DEVNULL,
+                            )
+                if result.returncode != 0:
+                    # Leave it for the next kick rather than spinning on errors
+                    break
+                self._ready.put(path)
+            if self._closing.is_set():
+                return
+
+
+class _WorktreeReaper:
+    """Lazily started daemon thread that removes worktrees without exec'ing git.
+
+    Each `git worktree remove` pays a full git startup. The reaper deletes a
+    worktree's directory and its admin entry under .git/worktrees in-process,
+    so stopping a wave of agents costs no git exec at all.
+    """
+
+    def __init__(
+        self, worktree_root: Path, lock: threading.Lock | None = None
+    ) -> None:
+        """Set up the reaper; its thread starts with the first removal.
+
+        Args:
+            worktree_root: Directory the adapter creates worktrees in. Paths
+                outside it are never deleted.
+            lock: Held while deleting a worktree's git metadata.
+        """
+        self.worktree_root = worktree_root.resolve()
+        self.lock = lock or threading.Lock()
+        self._queue: queue.Queue[tuple[list[str], threading.Event] | None] = (
+            queue.Queue()
+        )
+        self._closed = False
+        self._closed_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def remove(self, paths: list[str]) -> threading.Event:
+        """Queue worktrees for removal as one batch.
+
+        Once the reaper is closed the batch is removed on the calling thread
+        instead, so agents stopped after close() are still cleaned up.
+
+        Args:
+            paths: Worktree directories.
+
+        Returns:
+            Event set once every worktree in the batch has been handled.
+        """
+        done = threading.Event()
+        with self._closed_lock:
+            if not self._closed:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="herd-worktree-reaper", daemon=True
+                    )
+                    self._thread.start()
+                self._queue.put((paths, done))
+                return done
+        try:
+            for path in paths:
+                self._reap(Path(path))
+        finally:
+            done.set()
+        return done
+
+    def close(self) -> None:
+        """Finish queued removals and stop the thread."""
+        with self._closed_lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._thread is None:
+                return
+            self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        """Reap each batch as soon as it arrives, folding in any already queued."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            closing = False
+            # Never wait for more work: stop() blocks on the result
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    closing = True
+                    break
+                batch.append(item)
+            try:
+                for paths, _ in batch:
+                    for path in paths:
+                        self._reap(Path(path))
+            finally:
+                for _, done in batch:
+                    done.set()
+            if closing:
+                return
+
+    def _reap(self, path: Path) -> None:
+        """Delete one worktree and its git metadata, as `git worktree remove` would.
+
+        Paths outside worktree_root and locked worktrees are left alone.
+
+        Args:
+            path: Worktree directory.
+        """
+        path = path.resolve()
+        if path == self.worktree_root or not path.is_relative_to(self.worktree_root):
+            return
+
+        # A linked worktree's .git file names its admin dir in the main repo
+        admin = None
+        try:
+            gitfile = (path / ".git").read_text()
+        except OSError:
+            gitfile = ""
+        if gitfile.startswith("gitdir:"):
+            admin = (path / gitfile[len("gitdir:") :].strip()).resolve()
+            if admin.parent.name != "worktrees":
+                admin = None
+        if admin is not None and (admin / "locked").exists():
+            return
+
+        shutil.rmtree(path, ignore_errors=True)
+        if admin is not None:
+            with self.lock:
+                shutil.rmtree(admin, ignore_errors=True)
+
+
+class _Tracked:
+    """Adapter-side bookkeeping for one spawned agent.
+
+    Keeps the process handle and exit watcher next to the public AgentRecord
+    rather than patching them onto it.
+    """
+
+    __slots__ = ("record", "process", "pidfd", "restore_ref", "events", "partial")
+
+    def __init__(
+        self,
+        record: AgentRecord,
+        process: subprocess.Popen[bytes],
+        restore_ref: str | None = None,
+    ) -> None:
+        self.record = record
+        self.process = process
+        self.pidfd: int | None = None
+        # Branch repo_root was on before a non-isolated agent took it over
+        self.restore_ref = restore_ref
+        self.events: deque[dict] = deque(maxlen=_MAX_EVENTS)
+        # Trailing bytes of a stream-json line that has not been completed yet
+        self.partial = bytearray()
+
+    def feed(self, chunk: bytes) -> None:
+        """Parse a chunk of the CLI's stream-json output into events.
+
+        Args:
+            chunk: Raw bytes read from stdout. An empty chunk marks EOF and
+                flushes a final unterminated line.
+        """
+        self.partial += chunk or b"\n"
+        end = self.partial.rfind(b"\n")
+        if end < 0:
+            return
+        lines = self.partial[:end].split(b"\n")
+        del self.partial[: end + 1]
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                self.events.append(json.loads(line))
+            except ValueError:
+                # The CLI occasionally prints plain text; it carries no event
+                continue
+
+
+class _OutputReader:
+    """Daemon thread draining every agent's stdout through one selector.
+
+    The CLI blocks once its 64KB stdout pipe fills, so the output has to be
+    consumed even when nobody asks for it. A single epoll/kqueue loop serves
+    all agents instead of a reader thread (or blocking read) per process.
+    The selector and thread are only created for the first agent, and the
+    loop blocks until there is output or close() writes to a wake pipe.
+    """
+
+    def __init__(self) -> None:
+        """Set up the reader; its thread starts with the first watch()."""
+        self._selector: selectors.BaseSelector | None = None
+        self._wake: tuple[int, int] | None = None
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def watch(self, tracked: _Tracked) -> None:
+        """Start draining an agent's stdout into its events.
+
+        After close() the pipe is closed straight away instead.
+
+        Args:
+            tracked: Bookkeeping entry whose process has a piped stdout.
+        """
+        with self._lock:
+            if self._closed:
+                tracked.process.stdout.close()
+                return
+            if self._thread is None:
+                self._selector = selectors.DefaultSelector()
+                self._wake = os.pipe()
+                # Registered without data, which marks it as the wake pipe
+                self._selector.register(self._wake[0], selectors.EVENT_READ)
+                self._thread = threading.Thread(
+                    target=self._run, name="herd-output-reader", daemon=True
+                )
+                self._thread.start()
+            self._selector.register(
+                tracked.process.stdout, selectors.EVENT_READ, tracked
+            )
+
+    def close(self) -> None:
+        """Stop the reader thread and close every pipe still being drained.
+
+        Agents that are still running get EPIPE on their next write rather
+        than blocking forever on a full pipe nobody reads.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._thread is None:
+                return
+            os.write(self._wake[1], b"\0")
+        self._thread.join()
+        for key in list(self._selector.get_map().values()):
+            if key.data is not None:
+                self._drop(key)
+        self._selector.close()
+        os.close(self._wake[0])
+        os.close(self._wake[1])
+
+    def _run(self) -> None:
+        """Read whatever is ready, closing pipes as they reach EOF."""
+        while True:
+            for key, _ in self._selector.select():
+                if key.data is None:
+                    return
+                tracked: _Tracked = key.data
+                try:
+                    chunk = os.read(key.fd, 65536)
+                    tracked.feed(chunk)
+                except Exception:
+                    # Give up on this agent's output, not on every agent's
+                    self._drop(key)
+                    continue
+                if not chunk:
+                    self._drop(key)
+
+    def _drop(self, key: selectors.SelectorKey) -> None:
+        """Stop draining a pipe and close it.
+
+        Args:
+            key: Selector registration of the pipe.
+        """
+        self._selector.unregister(key.fileobj)
+        key.fileobj.close()
 
 
 class ClaudeAgentAdapter:
     """AgentAdapter implementation for Claude Code CLI.
 
-    Spawns agents as Claude CLI subprocesses in isolated git worktrees.
+    Spawns agents as Claude CLI subprocesses in isolated git worktrees, or
+    directly in the main checkout for single-tenant roles.
     Each instance runs in background with full Herd governance context.
     """
 
@@ -25,6 +497,8 @@ class ClaudeAgentAdapter:
         repo_root: str,
         worktree_root: str = "/private/tmp",
         branch_prefix: str = "herd",
+        pool_size: int = 0,
+        background_fetch: bool = False,
     ) -> None:
         """Initialize the adapter.
 
@@ -32,11 +506,101 @@ class ClaudeAgentAdapter:
             repo_root: Path to the main repository.
             worktree_root: Directory for creating worktrees (default: /private/tmp).
             branch_prefix: Git branch prefix (default: herd).
+            pool_size: Number of worktrees to pre-create in the background so
+                spawn() can skip the checkout (default: 0, disabled). Pooled
+                worktrees are cut from HEAD at the time they are created, or
+                from the branch a non-isolated agent displaced from repo_root.
+            background_fetch: Run `git fetch` off the spawn hot path after each
+                spawn so refs are fresh for later work (default: False).
         """
         self.repo_root = Path(repo_root)
         self.worktree_root = Path(worktree_root)
         self.branch_prefix = branch_prefix
-        self._instances: dict[str, AgentRecord] = {}
+        self._branch_prefix_slash = f"{branch_prefix}/"
+        self._instances: dict[str, _Tracked] = {}
+        self.background_fetch = background_fetch
+        # Agents inherit the environment as it was when the adapter was built
+        self._base_env = os.environ.copy()
+        # Resolve executables once rather than walking PATH on every exec
+        self._git_bin = shutil.which("git") or "git"
+        self._claude_bin = shutil.which("claude") or "claude"
+        # git races when several processes register worktrees in one repo at
+        # once, so adding, moving and removing them is serialized
+        self._worktree_lock = threading.Lock()
+        self._pool: _WorktreePool | None = None
+        if pool_size > 0:
+            self._pool = _WorktreePool(
+                self.repo_root,
+                self.worktree_root / ".pool",
+                pool_size,
+                self._git_bin,
+                self._worktree_lock,
+            )
+        self._bg = ThreadPoolExecutor(max_workers=2, thread_name_prefix="herd-bg")
+        # Spawns are dominated by git and exec, which release the GIL
+        self._spawn_executor = ThreadPoolExecutor(
+            max_workers=(os.cpu_count() or 1) * 2, thread_name_prefix="herd-spawn"
+        )
+        # Created with the first watched agent, see _watch_exit()
+        self._poller: select.epoll | None = None
+        self._harvest_wake: tuple[int, int] | None = None
+        self._harvester: threading.Thread | None = None
+        self._watch_lock = threading.Lock()
+        self._closed = False
+        self._pidfd_owners: dict[int, str] = {}
+        # Exit codes collected by the harvester; get_status() only reads them
+        self._exit_codes: dict[str, int] = {}
+        self._unreported: set[str] = set()
+        self._exit_cond = threading.Condition()
+        self._reaper = _WorktreeReaper(self.worktree_root, self._worktree_lock)
+        # repo_root is a critical section for agents spawned with isolate=False
+        self._repo_lock = threading.Lock()
+        self._in_place: str | None = None
+        # While such an agent holds repo_root its HEAD is the agent's branch, so
+        # new worktrees are cut from the branch it replaced instead
+        self._start_point = "HEAD"
+        self._reader = _OutputReader()
+        # Worktree names held by live agents, checked before touching the disk
+        self._taken: set[str] = set()
+        self._taken_lock = threading.Lock()
+
+    def __enter__(self) -> ClaudeAgentAdapter:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release background resources held by the adapter.
+
+        Stops the worktree pool refiller, removes any unclaimed pooled
+        worktrees, waits for background git work, closes exit watchers and
+        stops the worktree reaper and output reader. Running agents are not
+        stopped, but their stdout pipes are closed, so further output fails
+        with EPIPE instead of blocking.
+        """
+        self._spawn_executor.shutdown(wait=True)
+        self._bg.shutdown(wait=True)
+
+        with self._watch_lock:
+            self._closed = True
+            harvester = self._harvester
+            if harvester is not None:
+                os.write(self._harvest_wake[1], b"\0")
+        if harvester is not None:
+            harvester.join()
+            for pidfd in list(self._pidfd_owners):
+                self._release_pidfd(pidfd)
+            self._poller.close()
+            os.close(self._harvest_wake[0])
+            os.close(self._harvest_wake[1])
+
+        if self._pool is not None:
+            self._reaper.remove([str(path) for path in self._pool.close()])
+            self._pool = None
+
+        self._reaper.close()
+        self._reader.close()
 
     def spawn(
         self,
@@ -45,82 +609,110 @@ class ClaudeAgentAdapter:
         context: SpawnContext,
         *,
         model: str | None = None,
+        sparse_paths: list[str] | None = None,
+        isolate: bool = True,
     ) -> SpawnResult:
         """Spawn an agent instance with full context.
 
+        If the preferred worktree name is held by another agent or left over
+        on disk, the worktree and branch names get the first eight characters
+        of the instance ID as a suffix.
+
         Args:
             role: Agent role code (e.g., "grunt", "pikasso").
             ticket_id: Ticket identifier for this assignment.
             context: Complete context envelope (role, craft, guidelines, assignment).
             model: Optional model override.
+            sparse_paths: Optional directories to check out in cone mode. The
+                whole repository is checked out when omitted.
+            isolate: Run in a dedicated worktree (default: True). When False,
+                the agent's branch is checked out directly in repo_root, which
+                must be clean and only one such agent may occupy at a time.
+                stop() discards the agent's uncommitted edits to tracked files
+                but leaves any untracked files it created in repo_root.
 
         Returns:
             SpawnResult with instance_id, worktree path, and branch name.
 
         Raises:
-            RuntimeError: If worktree creation or subprocess spawn fails.
+            ValueError: If sparse_paths is given with isolate=False.
+            RuntimeError: If worktree creation or subprocess spawn fails, or
+                repo_root is dirty or already occupied by a non-isolated agent.
         """
+        from herd_core.types import AgentRecord, AgentState, SpawnResult
+
         # Generate instance ID
         instance_id = str(uuid.uuid4())
 
-        # Create worktree
-        worktree_path = self.worktree_root / f"{role}-{ticket_id.lower()}"
-        branch_name = f"{self.branch_prefix}/{role}/{ticket_id.lower()}-agent-spawn"
+        if sparse_paths and not isolate:
+            raise ValueError("sparse_paths requires an isolated worktree")
 
-        try:
-            subprocess.run(
-                ["git", "worktree", "add", str(worktree_path), "-b", branch_name],
-                cwd=str(self.repo_root),
-                check=True,
-                capture_output=True,
-                text=True,
-            )
-        except subprocess.CalledProcessError as e:
-            raise RuntimeError(
-                f"Failed to create worktree at {worktree_path}: {e.stderr}"
-            ) from e
+        # Create worktree, dodging names already in use
+        tid = ticket_id.lower()
+        suffix = self._reserve_worktree(f"{role}-{tid}", instance_id) if isolate else ""
+        worktree_path = self.worktree_root / f"{role}-{tid}{suffix}"
+        branch_name = f"{self._branch_prefix_slash}{role}/{tid}{suffix}-agent-spawn"
+
+        restore_ref = None
+        if isolate:
+            try:
+                self._create_worktree(worktree_path, branch_name, sparse_paths)
+            except RuntimeError:
+                self._release_worktree(worktree_path)
+                raise
+        else:
+            worktree_path = self.repo_root
+            restore_ref = self._claim_repo_root(instance_id, branch_name)
 
         # Assemble full context prompt
-        context_prompt = self._assemble_context_prompt(
+        context_prompt = self._assemble_context_prompt_bytes(
             role, ticket_id, branch_name, context, worktree_path
         )
 
         # Start Claude CLI subprocess in background
+        process = None
         try:
-            # Write context to temp file to avoid shell escaping issues
-            with tempfile.NamedTemporaryFile(
-                mode="w", suffix=".txt", delete=False
-            ) as f:
-                f.write(context_prompt)
-                temp_prompt_file = f.name
-
             # Start claude process (will run until completion or stopped)
             process = subprocess.Popen(
                 [
-                    "claude",
+                    self._claude_bin,
                     "-p",
-                    f"@{temp_prompt_file}",
                     "--verbose",
                     "--output-format",
                     "stream-json",
                 ],
                 cwd=str(worktree_path),
+                stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                env={**os.environ, "HERD_AGENT_NAME": role},
+                stderr=subprocess.DEVNULL,
+                env=dict(self._base_env, HERD_AGENT_NAME=role),
             )
 
-            # Clean up temp file
-            os.unlink(temp_prompt_file)
+            # Hand the prompt over stdin: no temp file, no shell escaping
+            process.stdin.write(context_prompt)
+            process.stdin.close()
 
         except Exception as e:
+            if process is not None:
+                process.kill()
+                process.wait()
             # Clean up worktree on spawn failure
-            subprocess.run(
-                ["git", "worktree", "remove", str(worktree_path), "--force"],
+            if restore_ref is not None:
+                self._release_repo_root(instance_id, branch_name, restore_ref)
+            else:
+                self._discard_worktree(worktree_path, branch_name)
+                self._release_worktree(worktree_path)
+            raise RuntimeError(f"Failed to spawn Claude process: {e}") from e
+
+        # Off the critical path: refresh refs for later work
+        if self.background_fetch:
+            self._bg.submit(
+                subprocess.run,
+                [self._git_bin, "fetch", "--quiet"],
                 cwd=str(self.repo_root),
-                capture_output=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
             )
-            raise RuntimeError(f"Failed to spawn Claude process: {e}") from e
 
         # Track instance
         now = datetime.now()
@@ -136,10 +728,10 @@ class ClaudeAgentAdapter:
             started_at=now,
             created_at=now,
         )
-        self._instances[instance_id] = agent_record
-
-        # Store process handle in a private attribute (not in AgentRecord)
-        agent_record._process = process  # type: ignore
+        tracked = _Tracked(agent_record, process, restore_ref)
+        self._instances[instance_id] = tracked
+        self._watch_exit(instance_id, tracked)
+        self._reader.watch(tracked)
 
         return SpawnResult(
             instance_id=instance_id,
@@ -151,6 +743,65 @@ class ClaudeAgentAdapter:
             spawned_at=now,
         )
 
+    def spawn_many(
+        self,
+        requests: list[tuple[str, str, SpawnContext]],
+        *,
+        model: str | None = None,
+    ) -> list[SpawnResult]:
+        """Spawn several agent instances concurrently.
+
+        Worktree creation and process startup for each request overlap on a
+        thread pool that lives as long as the adapter.
+
+        Args:
+            requests: (role, ticket_id, context) tuples, one per agent.
+            model: Optional model override applied to every agent.
+
+        Returns:
+            SpawnResults in the same order as requests.
+
+        Raises:
+            RuntimeError: If any spawn fails. Raised once every spawn has
+                finished and the agents that did start have been stopped and
+                forgotten, so a failed batch leaves nothing running.
+        """
+        futures = [
+            self._spawn_executor.submit(
+                self.spawn, role, ticket_id, context, model=model
+            )
+            for role, ticket_id, context in requests
+        ]
+        wait(futures)
+
+        errors = [f.exception() for f in futures if f.exception() is not None]
+        if not errors:
+            return [future.result() for future in futures]
+
+        # The caller never learns these instance IDs, so nothing else could stop them
+        started = [f.result().instance_id for f in futures if f.exception() is None]
+        for instance_id in started:
+            # The harvester must not look these up once they are forgotten
+            pidfd = self._instances[instance_id].pidfd
+            if pidfd is not None:
+                self._release_pidfd(pidfd)
+        self.stop_many(started)
+        branches = [self._instances[instance_id].record.branch for instance_id in started]
+        if branches:
+            # Fresh and commit-free, they would only block retrying the batch
+            subprocess.run(
+                [self._git_bin, "branch", "-d", *branches],
+                cwd=str(self.repo_root),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        with self._exit_cond:
+            for instance_id in started:
+                del self._instances[instance_id]
+                self._exit_codes.pop(instance_id, None)
+                self._unreported.discard(instance_id)
+        raise errors[0]
+
     def get_status(self, instance_id: str) -> AgentRecord:
         """Get current state of an agent instance.
 
@@ -163,15 +814,25 @@ class ClaudeAgentAdapter:
         Raises:
             KeyError: If instance_id is not found.
         """
+        from herd_core.types import AgentState
+
         if instance_id not in self._instances:
             raise KeyError(f"Instance {instance_id} not found")
 
-        record = self._instances[instance_id]
+        tracked = self._instances[instance_id]
+        record = tracked.record
 
-        # Check process status if available
-        if hasattr(record, "_process"):
-            process = record._process  # type: ignore
-            poll_result = process.poll()
+        # Check process status while it can still change; once ended the
+        # record is final and needs neither a syscall nor a new timestamp
+        if record.state == AgentState.RUNNING:
+            poll_result = self._exit_codes.get(instance_id)
+            harvester = self._harvester
+            if poll_result is None and (
+                tracked.pidfd is None or harvester is None or not harvester.is_alive()
+            ):
+                # Not watched by the harvester (no pidfd support), or the
+                # harvester is gone (closed or crashed)
+                poll_result = tracked.process.poll()
 
             if poll_result is not None:
                 # Process has ended
@@ -183,52 +844,457 @@ class ClaudeAgentAdapter:
 
         return record
 
-    def stop(self, instance_id: str) -> None:
-        """Stop a running agent instance.
+    def get_events(self, instance_id: str) -> list[dict]:
+        """Get the stream-json events an agent has emitted so far.
+
+        Only the most recent events are retained.
 
         Args:
             instance_id: Instance identifier from spawn().
 
+        Returns:
+            Parsed events, oldest first.
+
         Raises:
             KeyError: If instance_id is not found.
         """
         if instance_id not in self._instances:
             raise KeyError(f"Instance {instance_id} not found")
 
-        record = self._instances[instance_id]
+        return list(self._instances[instance_id].events)
 
-        # Terminate process
-        if hasattr(record, "_process"):
-            process = record._process  # type: ignore
-            if process.poll() is None:
-                process.terminate()
-                try:
-                    process.wait(timeout=5.0)
-                except subprocess.TimeoutExpired:
-                    process.kill()
-                    process.wait()
+    def stop(self, instance_id: str) -> None:
+        """Stop a running agent instance.
+
+        Args:
+            instance_id: Instance identifier from spawn().
+
+        Raises:
+            KeyError: If instance_id is not found.
+        """
+        self.stop_many([instance_id])
+
+    def stop_many(self, instance_ids: list[str]) -> None:
+        """Stop several agent instances and remove their worktrees in one batch.
+
+        Args:
+            instance_ids: Instance identifiers from spawn().
+
+        Raises:
+            KeyError: If any instance_id is not found. Nothing is stopped.
+        """
+        from herd_core.types import AgentState
+
+        for instance_id in instance_ids:
+            if instance_id not in self._instances:
+                raise KeyError(f"Instance {instance_id} not found")
+
+        entries = [self._instances[instance_id] for instance_id in instance_ids]
+        records = [entry.record for entry in entries]
+
+        # Signal every process first so they shut down concurrently
+        terminated = []
+        for entry in entries:
+            if entry.process.poll() is None:
+                entry.process.terminate()
+                terminated.append(entry.process)
+
+        for process in terminated:
+            try:
+                process.wait(timeout=5.0)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+        # Clean up worktrees; state only changes once the reaper confirms
+        removed = self._reaper.remove(
+            [
+                entry.record.worktree
+                for entry in entries
+                if entry.restore_ref is None and entry.record.worktree
+            ]
+        )
+        for instance_id, entry in zip(instance_ids, entries):
+            if entry.restore_ref is not None:
+                self._release_repo_root(
+                    instance_id, entry.record.branch, entry.restore_ref
+                )
+        removed.wait()
+        for entry in entries:
+            if entry.restore_ref is None and entry.record.worktree:
+                self._release_worktree(Path(entry.record.worktree))
+
+        # Update state, keeping the original end time of agents that had
+        # already finished
+        now = datetime.now()
+        for record in records:
+            record.state = AgentState.STOPPED
+            if record.ended_at is None:
+                record.ended_at = now
+
+    def poll_all(self, timeout: float = 0) -> set[str]:
+        """Report agents whose processes have exited.
+
+        Exits are collected in the background by a harvester thread that
+        blocks on every agent's pidfd in a single epoll set. Agents
+        spawned without a pidfd (non-Linux, kernel < 5.3) are never reported
+        here and are polled directly by get_status().
+
+        Args:
+            timeout: Seconds to wait for an exit (default: 0, do not block).
+
+        Returns:
+            Instance IDs whose processes exited since the last call.
+        """
+        with self._exit_cond:
+            self._exit_cond.wait_for(lambda: self._unreported, timeout)
+            exited, self._unreported = self._unreported, set()
+        return exited
+
+    def _harvest(self) -> None:
+        """Record agent exit codes as the kernel reports them."""
+        while True:
+            for pidfd, _ in self._poller.poll():
+                if pidfd == self._harvest_wake[0]:
+                    # close() is shutting the harvester down
+                    return
+                # Released (e.g. by a spawn_many() rollback) since poll() returned
+                instance_id = self._pidfd_owners.get(pidfd)
+                if instance_id is None:
+                    continue
+                tracked = self._instances.get(instance_id)
+                if tracked is None:
+                    self._release_pidfd(pidfd)
+                    continue
+                # The process has exited, so this returns without blocking
+                returncode = tracked.process.wait()
+                with self._exit_cond:
+                    self._exit_codes[instance_id] = returncode
+                    self._unreported.add(instance_id)
+                    self._exit_cond.notify_all()
+                self._release_pidfd(pidfd)
+
+    def _watch_exit(self, instance_id: str, tracked: _Tracked) -> None:
+        """Register a pidfd for the agent so the harvester sees it exit.
+
+        Leaves tracked.pidfd as None if pidfds are unavailable.
+
+        Args:
+            instance_id: Instance the process belongs to.
+            tracked: Bookkeeping entry for the instance.
+        """
+        if not _HAS_PIDFD:
+            return
+        try:
+            pidfd = os.pidfd_open(tracked.process.pid)
+        except OSError:
+            # Kernel without pidfd_open, or the process is already gone
+            return
+        with self._watch_lock:
+            if self._closed:
+                # Nothing harvests any more; get_status() polls instead
+                os.close(pidfd)
+                return
+            if self._harvester is None:
+                # epoll picks up pidfds registered while the harvester waits
+                self._poller = select.epoll()
+                self._harvest_wake = os.pipe()
+                self._poller.register(self._harvest_wake[0], select.EPOLLIN)
+                self._harvester = threading.Thread(
+                    target=self._harvest, name="herd-exit-harvester", daemon=True
+                )
+                self._harvester.start()
+            tracked.pidfd = pidfd
+            self._pidfd_owners[pidfd] = instance_id
+            self._poller.register(pidfd, select.EPOLLIN)
+
+    def _release_pidfd(self, pidfd: int) -> str | None:
+        """Stop watching a pidfd and close it.
+
+        Safe to race with another release of the same pidfd; only one of them
+        closes it.
+
+        Args:
+            pidfd: Descriptor returned by _watch_exit().
+
+        Returns:
+            Instance ID the pidfd belonged to, or None if already released.
+        """
+        instance_id = self._pidfd_owners.pop(pidfd, None)
+        if instance_id is None:
+            return None
+        self._poller.unregister(pidfd)
+        os.close(pidfd)
+        tracked = self._instances.get(instance_id)
+        if tracked is not None:
+            tracked.pidfd = None
+        return instance_id
+
+    def _reserve_worktree(self, name: str, instance_id: str) -> str:
+        """Reserve a worktree directory name, suffixing it if already in use.
+
+        Names held by live agents are answered from memory; otherwise a single
+        stat catches directories left behind by a crashed run, which would make
+        `git worktree add` fail only after a full git exec.
+
+        Args:
+            name: Preferred worktree directory name.
+            instance_id: Instance the worktree is for; its prefix disambiguates.
+
+        Returns:
+            Suffix to append to the worktree and branch names ("" if none).
+        """
+        with self._taken_lock:
+            suffix = ""
+            if name in self._taken or (self.worktree_root / name).exists():
+                suffix = f"-{instance_id[:8]}"
+            self._taken.add(name + suffix)
+        return suffix
+
+    def _release_worktree(self, worktree_path: Path) -> None:
+        """Give a reserved worktree name back once its worktree is gone.
+
+        Args:
+            worktree_path: Worktree whose name was reserved.
+        """
+        with self._taken_lock:
+            self._taken.discard(worktree_path.name)
+
+    def _claim_repo_root(self, instance_id: str, branch_name: str) -> str:
+        """Check out a new branch directly in repo_root for a non-isolated agent.
+
+        Args:
+            instance_id: Instance taking over repo_root.
+            branch_name: Git branch to create.
+
+        Returns:
+            Branch repo_root was on, to restore when the agent stops.
+
+        Raises:
+            RuntimeError: If another non-isolated agent holds repo_root, it has
+                uncommitted changes, it is not on a branch, or the branch cannot
+                be created.
+        """
+        with self._repo_lock:
+            if self._in_place is not None:
+                raise RuntimeError(
+                    f"Instance {self._in_place} is already running in "
+                    f"{self.repo_root}; stop it first"
+                )
+            try:
+                # `switch -c` would carry local edits onto the agent's branch,
+                # where stop() discards them along with the agent's own
+                status = subprocess.run(
+                    [self._git_bin, "status", "--porcelain"],
+                    cwd=str(self.repo_root),
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                )
+                if status.stdout.strip():
+                    raise RuntimeError(
+                        f"{self.repo_root} has uncommitted changes; commit or "
+                        "stash them before spawning with isolate=False"
+                    )
+                current = subprocess.run(
+                    [self._git_bin, "symbolic-ref", "--short", "HEAD"],
+                    cwd=str(self.repo_root),
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                )
+                subprocess.run(
+                    [self._git_bin, "switch", "-c", branch_name],
+                    cwd=str(self.repo_root),
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                )
+            except subprocess.CalledProcessError as e:
+                raise RuntimeError(
+                    f"Failed to check out {branch_name} in {self.repo_root}: "
+                    f"{e.stderr}"
+                ) from e
+            restore_ref = current.stdout.strip()
+            self._in_place = instance_id
+            self._pin_start_point(restore_ref)
+            return restore_ref
+
+    def _release_repo_root(
+        self, instance_id: str, branch_name: str, restore_ref: str
+    ) -> None:
+        """Put repo_root back on its original branch and drop the agent's branch.
+
+        Uncommitted changes the agent left in tracked files are discarded.
+        Untracked files it created are not: they stay in repo_root, and the
+        next isolate=False spawn refuses to start until they are removed. The
+        branch is only deleted if it has no commits beyond the original
+        branch, so unpushed work is kept.
+
+        Does nothing if the instance no longer holds repo_root.
 
-        # Clean up worktree
-        if record.worktree:
+        Args:
+            instance_id: Instance releasing repo_root.
+            branch_name: Branch created for the agent.
+            restore_ref: Branch to switch back to.
+        """
+        with self._repo_lock:
+            if self._in_place != instance_id:
+                return
+            subprocess.run(
+                [self._git_bin, "switch", "--discard-changes", restore_ref],
+                cwd=str(self.repo_root),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
             subprocess.run(
-                ["git", "worktree", "remove", record.worktree, "--force"],
+                [self._git_bin, "branch", "-d", branch_name],
                 cwd=str(self.repo_root),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            self._in_place = None
+            self._pin_start_point("HEAD")
+
+    def _pin_start_point(self, start_point: str) -> None:
+        """Set the commit that new worktrees and pooled worktrees branch from.
+
+        Args:
+            start_point: Branch or commit to cut new worktrees from.
+        """
+        self._start_point = start_point
+        if self._pool is not None:
+            self._pool.start_point = start_point
+
+    def _create_worktree(
+        self,
+        worktree_path: Path,
+        branch_name: str,
+        sparse_paths: list[str] | None = None,
+    ) -> None:
+        """Create a worktree for a new branch, claiming a pooled one if possible.
+
+        Args:
+            worktree_path: Destination path for the worktree.
+            branch_name: Git branch to create.
+            sparse_paths: Directories to check out in cone mode, or None for a
+                full checkout. Sparse worktrees never come from the pool.
+
+        Raises:
+            RuntimeError: If any git step fails.
+        """
+        pooled = None
+        if self._pool is not None and not sparse_paths:
+            pooled = self._pool.take()
+
+        # Worktree and branch to discard if a later git step fails
+        created = pooled
+        branched = False
+
+        try:
+            if pooled is not None:
+                # Pooled worktree is already checked out; name the branch and move it
+                subprocess.run(
+                    [self._git_bin, "switch", "-c", branch_name],
+                    cwd=str(pooled),
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                )
+                branched = True
+                with self._worktree_lock:
+                    subprocess.run(
+                        [
+                            self._git_bin,
+                            "worktree",
+                            "move",
+                            str(pooled),
+                            str(worktree_path),
+                        ],
+                        cwd=str(self.repo_root),
+                        check=True,
+                        capture_output=True,
+                        text=True,
+                    )
+                return
+
+            # Register the worktree without writing files, so only the quick
+            # registration holds the lock; then narrow it if asked and populate
+            with self._worktree_lock:
+                subprocess.run(
+                    [
+                        self._git_bin,
+                        "worktree",
+                        "add",
+                        "--no-checkout",
+                        str(worktree_path),
+                        "-b",
+                        branch_name,
+                        self._start_point,
+                    ],
+                    cwd=str(self.repo_root),
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                )
+            created = worktree_path
+            branched = True
+            if sparse_paths:
+                subprocess.run(
+                    [self._git_bin, "sparse-checkout", "set", "--cone", *sparse_paths],
+                    cwd=str(worktree_path),
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                )
+            subprocess.run(
+                [self._git_bin, "checkout"],
+                cwd=str(worktree_path),
+                check=True,
                 capture_output=True,
+                text=True,
             )
+        except subprocess.CalledProcessError as e:
+            if created is not None:
+                self._discard_worktree(created, branch_name if branched else None)
+            raise RuntimeError(
+                f"Failed to create worktree at {worktree_path}: {e.stderr}"
+            ) from e
 
-        # Update state
-        record.state = AgentState.STOPPED
-        record.ended_at = datetime.now()
+    def _discard_worktree(self, worktree_path: Path, branch_name: str | None) -> None:
+        """Remove a worktree that never got an agent, along with its new branch.
+
+        Args:
+            worktree_path: Worktree to remove.
+            branch_name: Branch created for it, or None to keep branches alone.
+        """
+        with self._worktree_lock:
+            subprocess.run(
+                [self._git_bin, "worktree", "remove", str(worktree_path), "--force"],
+                cwd=str(self.repo_root),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        if branch_name is not None:
+            subprocess.run(
+                [self._git_bin, "branch", "-d", branch_name],
+                cwd=str(self.repo_root),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
 
-    def _assemble_context_prompt(
+    def _assemble_context_prompt_bytes(
         self,
         role: str,
         ticket_id: str,
         branch_name: str,
         context: SpawnContext,
         worktree_path: Path,
-    ) -> str:
-        """Assemble the full context prompt for the agent.
+    ) -> bytes:
+        """Assemble the full context prompt as UTF-8, ready for the CLI's stdin.
+
+        The template literals and the role skeleton are encoded once rather
+        than on every spawn; only the per-spawn fields are encoded here.
 
         Args:
             role: Agent role code.
@@ -238,47 +1304,30 @@ class ClaudeAgentAdapter:
             worktree_path: Path to worktree.
 
         Returns:
-            Full context prompt string.
+            Full context prompt as bytes.
         """
-        # Build environment variables block
-        env_block = "\n".join(
-            f"export {key}={value}" for key, value in context.environment.items()
+        fields = {
+            "role_title": role.title(),
+            "ticket_id": ticket_id,
+            "branch_name": branch_name,
+            "worktree_path": str(worktree_path),
+            "role_definition": context.role_definition,
+            "assignment": context.assignment,
+            "env_block": "\n".join(
+                map("export {0[0]}={0[1]}".format, context.environment.items())
+            ),
+        }
+        skeleton = _encode_role_skeleton(
+            context.craft_standards,
+            context.project_guidelines,
+            tuple(context.skills),
         )
 
-        # Build skills block if any
-        skills_block = ""
-        if context.skills:
-            skills_block = "\n## SKILLS\n" + "\n".join(
-                f"- {skill}" for skill in context.skills
-            )
-
-        return f"""You are {role.title()}, spawned to work on {ticket_id}.
-
-## YOUR IDENTITY
-{context.role_definition}
-
-## CRITICAL GIT RULES
-- NEVER push to main. NEVER run `git push origin main`.
-- ALL work goes on your feature branch. Push ONLY your branch: `git push -u origin {branch_name}`
-- Create a PR from your branch. The Architect merges. You NEVER merge or push to main.
-- NEVER merge PRs. You do NOT have merge authority. Submitting the PR is the end of your responsibility.
-
-## ENVIRONMENT
-{env_block}
-
-## WORKING DIRECTORY
-You are working in: {worktree_path}
-Branch: {branch_name}
-
-## ASSIGNMENT: {ticket_id}
-{context.assignment}
-
-## CRAFT STANDARDS
-{context.craft_standards}
-
-## PROJECT GUIDELINES
-{context.project_guidelines}
-{skills_block}
-
-START WORKING NOW.
-"""
+        parts = []
+        for literal, field in _PROMPT_SEGMENTS:
+            parts.append(literal)
+            if field == "role_skeleton":
+                parts.append(skeleton)
+            elif field is not None:
+                parts.append(fields[field].encode())
+        return b"".join(parts)
@@ -2,7 +2,13 @@
 
 from __future__ import annotations
 
+import os
+import shutil
 import subprocess
+import sys
+import threading
+import time
+from collections.abc import Iterator
 from datetime import datetime
 from pathlib import Path
 from unittest.mock import MagicMock, Mock, call, patch
@@ -10,10 +16,32 @@ from unittest.mock import MagicMock, Mock, call, patch
 import pytest
 
 from herd_agent_claude import ClaudeAgentAdapter
+from herd_agent_claude.adapter import _OutputReader, _Tracked, _WorktreeReaper
 from herd_core.adapters.agent import AgentAdapter
 from herd_core.types import AgentState, SpawnContext
 
 
+@pytest.fixture(autouse=True)
+def no_pidfd() -> Iterator[None]:
+    """Keep mocked processes on the process.poll() path."""
+    with patch("herd_agent_claude.adapter._HAS_PIDFD", False):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def no_output_reader() -> Iterator[None]:
+    """Keep mocked process pipes away from the real reader thread."""
+    with patch("herd_agent_claude.adapter._OutputReader"):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def bare_executables() -> Iterator[None]:
+    """Leave git and claude unresolved so commands compare by bare name."""
+    with patch("herd_agent_claude.adapter.shutil.which", return_value=None):
+        yield
+
+
 @pytest.fixture
 def adapter() -> ClaudeAgentAdapter:
     """Create a test adapter instance."""
@@ -42,6 +70,15 @@ def test_adapter_is_protocol_instance(adapter: ClaudeAgentAdapter) -> None:
     assert isinstance(adapter, AgentAdapter)
 
 
+def test_import_defers_herd_core_types() -> None:
+    """Test importing the package does not load herd_core.types eagerly."""
+    code = (
+        "import sys, herd_agent_claude; "
+        "sys.exit('herd_core.types' in sys.modules)"
+    )
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+
+
 def test_adapter_initialization() -> None:
     """Test adapter initialization with default and custom params."""
     adapter = ClaudeAgentAdapter(repo_root="/test/repo")
@@ -59,11 +96,24 @@ def test_adapter_initialization() -> None:
     assert adapter.branch_prefix == "custom"
 
 
+def test_adapter_starts_no_threads_until_needed() -> None:
+    """Test an adapter that never spawns holds no threads or descriptors."""
+    before = threading.active_count()
+    with (
+        patch("herd_agent_claude.adapter._HAS_PIDFD", True),
+        patch("herd_agent_claude.adapter._OutputReader", _OutputReader),
+    ):
+        adapter = ClaudeAgentAdapter(repo_root="/test/repo")
+
+    assert threading.active_count() == before
+    assert adapter._poller is None
+    assert adapter._reader._selector is None
+    adapter.close()
+
+
 @patch("herd_agent_claude.adapter.subprocess.run")
 @patch("herd_agent_claude.adapter.subprocess.Popen")
-@patch("herd_agent_claude.adapter.os.unlink")
 def test_spawn_creates_worktree_and_starts_process(
-    mock_unlink: Mock,
     mock_popen: Mock,
     mock_run: Mock,
     adapter: ClaudeAgentAdapter,
@@ -77,30 +127,41 @@ def test_spawn_creates_worktree_and_starts_process(
 
     result = adapter.spawn("grunt", "DBC-123", spawn_context, model="claude-opus-4")
 
-    # Verify worktree creation
-    mock_run.assert_called_once()
-    worktree_call = mock_run.call_args
+    # Verify worktree registration, then checkout inside it
+    assert mock_run.call_count == 2
+    worktree_call, checkout_call = mock_run.call_args_list
     assert worktree_call[0][0] == [
         "git",
         "worktree",
         "add",
+        "--no-checkout",
         "/private/tmp/grunt-dbc-123",
         "-b",
         "herd/grunt/dbc-123-agent-spawn",
+        "HEAD",
     ]
     assert worktree_call[1]["cwd"] == "/test/repo"
+    assert checkout_call[0][0] == ["git", "checkout"]
+    assert checkout_call[1]["cwd"] == "/private/tmp/grunt-dbc-123"
 
     # Verify Claude process spawn
     mock_popen.assert_called_once()
     popen_call = mock_popen.call_args
-    assert popen_call[0][0][0] == "claude"
-    assert popen_call[0][0][1] == "-p"
-    assert popen_call[0][0][2].startswith("@")  # Temp file path
+    assert popen_call[0][0] == [
+        "claude",
+        "-p",
+        "--verbose",
+        "--output-format",
+        "stream-json",
+    ]
+    assert popen_call[1]["stdin"] == subprocess.PIPE
     assert popen_call[1]["cwd"] == "/private/tmp/grunt-dbc-123"
     assert popen_call[1]["env"]["HERD_AGENT_NAME"] == "grunt"
 
-    # Verify temp file was deleted
-    mock_unlink.assert_called_once()
+    # Verify prompt was piped over stdin
+    prompt = mock_process.stdin.write.call_args[0][0]
+    assert b"You are Grunt, spawned to work on DBC-123" in prompt
+    mock_process.stdin.close.assert_called_once()
 
     # Verify SpawnResult
     assert result.agent == "grunt"
@@ -114,9 +175,49 @@ def test_spawn_creates_worktree_and_starts_process(
 
 @patch("herd_agent_claude.adapter.subprocess.run")
 @patch("herd_agent_claude.adapter.subprocess.Popen")
-@patch("herd_agent_claude.adapter.os.unlink")
+def test_spawn_uses_resolved_executables(
+    mock_popen: Mock,
+    mock_run: Mock,
+    spawn_context: SpawnContext,
+) -> None:
+    """Test spawn execs the absolute paths resolved at construction."""
+    mock_run.return_value = MagicMock(returncode=0)
+    mock_popen.return_value = MagicMock()
+    resolved = {"git": "/usr/bin/git", "claude": "/opt/bin/claude"}
+    with patch("herd_agent_claude.adapter.shutil.which", side_effect=resolved.get):
+        adapter = ClaudeAgentAdapter(repo_root="/test/repo")
+
+    adapter.spawn("grunt", "DBC-123", spawn_context)
+
+    assert mock_run.call_args[0][0][0] == "/usr/bin/git"
+    assert mock_popen.call_args[0][0][0] == "/opt/bin/claude"
+
+
+@patch("herd_agent_claude.adapter.subprocess.run")
+@patch("herd_agent_claude.adapter.subprocess.Popen")
+def test_spawn_env_does_not_leak_between_agents(
+    mock_popen: Mock,
+    mock_run: Mock,
+    adapter: ClaudeAgentAdapter,
+    spawn_context: SpawnContext,
+) -> None:
+    """Test each agent gets its own copy of the precomputed environment."""
+    mock_run.return_value = MagicMock(returncode=0)
+    mock_popen.return_value = MagicMock()
+
+    adapter.spawn("grunt", "DBC-123", spawn_context)
+    adapter.spawn("pikasso", "DBC-124", spawn_context)
+
+    first_env = mock_popen.call_args_list[0][1]["env"]
+    second_env = mock_popen.call_args_list[1][1]["env"]
+    assert first_env["HERD_AGENT_NAME"] == "grunt"
+    assert second_env["HERD_AGENT_NAME"] == "pikasso"
+    assert "HERD_AGENT_NAME" not in adapter._base_env
+
+
+@patch("herd_agent_claude.adapter.subprocess.run")
+@patch("herd_agent_claude.adapter.subprocess.Popen")
 def test_spawn_uses_default_model(
-    mock_unlink: Mock,
     mock_popen: Mock,
     mock_run: Mock,
     adapter: ClaudeAgentAdapter,
@@ -131,17 +232,134 @@ def test_spawn_uses_default_model(
 
 
 @patch("herd_agent_claude.adapter.subprocess.run")
-def test_spawn_failure_cleans_up_worktree(
+@patch("herd_agent_claude.adapter.subprocess.Popen")
+def test_spawn_sparse_checkout(
+    mock_popen: Mock,
     mock_run: Mock,
     adapter: ClaudeAgentAdapter,
     spawn_context: SpawnContext,
 ) -> None:
-    """Test spawn cleans up worktree on failure."""
-    # First call (worktree add) succeeds, second would be cleanup
-    mock_run.side_effect = [
-        MagicMock(returncode=0),  # worktree add
-        MagicMock(returncode=0),  # worktree remove (cleanup)
+    """Test spawn only checks out the requested paths when sparse_paths is set."""
+    mock_run.return_value = MagicMock(returncode=0)
+    mock_popen.return_value = MagicMock()
+
+    adapter.spawn("grunt", "DBC-123", spawn_context, sparse_paths=["src", "docs"])
+
+    commands = [c[0][0] for c in mock_run.call_args_list]
+    assert commands == [
+        [
+            "git",
+            "worktree",
+            "add",
+            "--no-checkout",
+            "/private/tmp/grunt-dbc-123",
+            "-b",
+            "herd/grunt/dbc-123-agent-spawn",
+            "HEAD",
+        ],
+        ["git", "sparse-checkout", "set", "--cone", "src", "docs"],
+        ["git", "checkout"],
+    ]
+    assert mock_run.call_args_list[1][1]["cwd"] == "/private/tmp/grunt-dbc-123"
+
+
+@patch("herd_agent_claude.adapter.subprocess.run")
+@patch("herd_agent_claude.adapter.subprocess.Popen")
+@patch("herd_agent_claude.adapter.shutil.rmtree")
+def test_spawn_without_isolation_uses_repo_root(
+    mock_rmtree: Mock,
+    mock_popen: Mock,
+    mock_run: Mock,
+    adapter: ClaudeAgentAdapter,
+    spawn_context: SpawnContext,
+) -> None:
+    """Test isolate=False checks the branch out in repo_root and restores it."""
+    porcelain = " M README\n"
+
+    def run(cmd: list[str], **kwargs: object) -> MagicMock:
+        if cmd[1] == "status":
+            return MagicMock(returncode=0, stdout=porcelain)
+        return MagicMock(returncode=0, stdout="main\n")
+
+    mock_run.side_effect = run
+    mock_process = MagicMock()
+    mock_process.poll.return_value = None
+    mock_popen.return_value = mock_process
+
+    # Local edits in repo_root would ride along onto the agent's branch
+    with pytest.raises(RuntimeError, match="uncommitted changes"):
+        adapter.spawn("architect", "DBC-123", spawn_context, isolate=False)
+    assert [c[0][0] for c in mock_run.call_args_list] == [
+        ["git", "status", "--porcelain"],
+    ]
+    mock_popen.assert_not_called()
+
+    porcelain = ""
+    mock_run.reset_mock()
+    result = adapter.spawn("architect", "DBC-123", spawn_context, isolate=False)
+
+    assert [c[0][0] for c in mock_run.call_args_list] == [
+        ["git", "status", "--porcelain"],
+        ["git", "symbolic-ref", "--short", "HEAD"],
+        ["git", "switch", "-c", "herd/architect/dbc-123-agent-spawn"],
     ]
+    assert mock_popen.call_args[1]["cwd"] == "/test/repo"
+    assert result.worktree == "/test/repo"
+
+    # repo_root holds one non-isolated agent at a time
+    with pytest.raises(RuntimeError, match="already running"):
+        adapter.spawn("architect", "DBC-124", spawn_context, isolate=False)
+
+    # Isolated agents branch from what repo_root was on, not the agent's work
+    mock_run.reset_mock()
+    adapter.spawn("grunt", "DBC-125", spawn_context)
+    assert mock_run.call_args_list[0][0][0][-1] == "main"
+
+    mock_run.reset_mock()
+    adapter.stop(result.instance_id)
+
+    mock_rmtree.assert_not_called()
+    assert [c[0][0] for c in mock_run.call_args_list] == [
+        ["git", "switch", "--discard-changes", "main"],
+        ["git", "branch", "-d", "herd/architect/dbc-123-agent-spawn"],
+    ]
+    assert adapter.get_status(result.instance_id).state == AgentState.STOPPED
+    assert adapter._start_point == "HEAD"
+
+
+@patch("herd_agent_claude.adapter.subprocess.run")
+@patch("herd_agent_claude.adapter.subprocess.Popen")
+def test_spawn_dodges_taken_worktree_names(
+    mock_popen: Mock,
+    mock_run: Mock,
+    tmp_path: Path,
+    spawn_context: SpawnContext,
+) -> None:
+    """Test spawn suffixes worktrees left on disk or held by a live agent."""
+    mock_run.return_value = MagicMock(returncode=0)
+    mock_popen.return_value = MagicMock()
+    (tmp_path / "grunt-dbc-123").mkdir()
+    adapter = ClaudeAgentAdapter(repo_root="/test/repo", worktree_root=str(tmp_path))
+
+    leftover = adapter.spawn("grunt", "DBC-123", spawn_context)
+    fresh = adapter.spawn("grunt", "DBC-124", spawn_context)
+    again = adapter.spawn("grunt", "DBC-124", spawn_context)
+
+    suffix = f"-{leftover.instance_id[:8]}"
+    assert leftover.worktree == str(tmp_path / f"grunt-dbc-123{suffix}")
+    assert leftover.branch == f"herd/grunt/dbc-123{suffix}-agent-spawn"
+    assert fresh.worktree == str(tmp_path / "grunt-dbc-124")
+    assert again.worktree == str(tmp_path / f"grunt-dbc-124-{again.instance_id[:8]}")
+
+
+@patch("herd_agent_claude.adapter.subprocess.run")
+def test_spawn_failure_cleans_up_worktree(
+    mock_run: Mock,
+    adapter: ClaudeAgentAdapter,
+    spawn_context: SpawnContext,
+) -> None:
+    """Test spawn cleans up worktree and branch on failure."""
+    mock_run.return_value = MagicMock(returncode=0)
 
     # Popen will fail
     with patch("herd_agent_claude.adapter.subprocess.Popen", side_effect=OSError("fail")):
@@ -149,8 +367,8 @@ def test_spawn_failure_cleans_up_worktree(
             adapter.spawn("grunt", "DBC-123", spawn_context)
 
     # Verify cleanup was called
-    assert mock_run.call_count == 2
-    cleanup_call = mock_run.call_args_list[1]
+    assert mock_run.call_count == 4
+    cleanup_call, branch_call = mock_run.call_args_list[2:]
     assert cleanup_call[0][0] == [
         "git",
         "worktree",
@@ -158,13 +376,183 @@ def test_spawn_failure_cleans_up_worktree(
         "/private/tmp/grunt-dbc-123",
         "--force",
     ]
+    assert cleanup_call[1]["stdout"] == subprocess.DEVNULL
+    assert cleanup_call[1]["stderr"] == subprocess.DEVNULL
+    # The branch is new, so a retry would trip over it
+    assert branch_call[0][0] == [
+        "git",
+        "branch",
+        "-d",
+        "herd/grunt/dbc-123-agent-spawn",
+    ]
+
+
+@patch("herd_agent_claude.adapter.subprocess.run")
+@patch("herd_agent_claude.adapter.subprocess.Popen")
+def test_spawn_kills_process_if_prompt_write_fails(
+    mock_popen: Mock,
+    mock_run: Mock,
+    adapter: ClaudeAgentAdapter,
+    spawn_context: SpawnContext,
+) -> None:
+    """Test spawn kills the CLI and removes the worktree if stdin breaks."""
+    mock_run.return_value = MagicMock(returncode=0)
+    mock_process = MagicMock()
+    mock_process.stdin.write.side_effect = BrokenPipeError()
+    mock_popen.return_value = mock_process
+
+    with pytest.raises(RuntimeError, match="Failed to spawn Claude process"):
+        adapter.spawn("grunt", "DBC-123", spawn_context)
+
+    mock_process.kill.assert_called_once()
+    assert mock_run.call_args_list[-2][0][0][:3] == ["git", "worktree", "remove"]
+
+
+@patch("herd_agent_claude.adapter.subprocess.run")
+@patch("herd_agent_claude.adapter.subprocess.Popen")
+def test_spawn_claims_pooled_worktree(
+    mock_popen: Mock,
+    mock_run: Mock,
+    adapter: ClaudeAgentAdapter,
+    spawn_context: SpawnContext,
+) -> None:
+    """Test spawn renames a pooled worktree instead of running worktree add."""
+    mock_run.return_value = MagicMock(returncode=0)
+    mock_popen.return_value = MagicMock()
+    adapter._pool = MagicMock()
+    adapter._pool.take.return_value = Path("/private/tmp/.pool/abc")
+
+    result = adapter.spawn("grunt", "DBC-123", spawn_context)
+
+    assert mock_run.call_args_list[0][0][0] == [
+        "git",
+        "switch",
+        "-c",
+        "herd/grunt/dbc-123-agent-spawn",
+    ]
+    assert mock_run.call_args_list[0][1]["cwd"] == "/private/tmp/.pool/abc"
+    assert mock_run.call_args_list[1][0][0] == [
+        "git",
+        "worktree",
+        "move",
+        "/private/tmp/.pool/abc",
+        "/private/tmp/grunt-dbc-123",
+    ]
+    assert result.worktree == "/private/tmp/grunt-dbc-123"
+
+
+@patch("herd_agent_claude.adapter.subprocess.run")
+@patch("herd_agent_claude.adapter.shutil.rmtree")
+def test_close_removes_unclaimed_pooled_worktrees(
+    mock_rmtree: Mock, mock_run: Mock, adapter: ClaudeAgentAdapter
+) -> None:
+    """Test close stops the pool and removes worktrees nobody claimed."""
+    pool = MagicMock()
+    pool.close.return_value = [Path("/private/tmp/.pool/abc")]
+    adapter._pool = pool
+
+    adapter.close()
+
+    pool.close.assert_called_once()
+    mock_rmtree.assert_called_once_with(
+        Path("/private/tmp/.pool/abc").resolve(), ignore_errors=True
+    )
+    mock_run.assert_not_called()
+    assert adapter._pool is None
+
+
+@patch("herd_agent_claude.adapter.subprocess.run")
+@patch("herd_agent_claude.adapter.subprocess.Popen")
+def test_spawn_background_fetch(
+    mock_popen: Mock,
+    mock_run: Mock,
+    spawn_context: SpawnContext,
+) -> None:
+    """Test spawn schedules git fetch off the hot path when enabled."""
+    mock_run.return_value = MagicMock(returncode=0)
+    mock_popen.return_value = MagicMock()
+    adapter = ClaudeAgentAdapter(repo_root="/test/repo", background_fetch=True)
+
+    adapter.spawn("grunt", "DBC-123", spawn_context)
+    adapter.close()
+
+    fetch_calls = [c for c in mock_run.call_args_list if c[0][0][1] == "fetch"]
+    assert len(fetch_calls) == 1
+    assert fetch_calls[0][1]["cwd"] == "/test/repo"
+
+
+@patch("herd_agent_claude.adapter.subprocess.run")
+@patch("herd_agent_claude.adapter.subprocess.Popen")
+def test_spawn_many_returns_results_in_order(
+    mock_popen: Mock,
+    mock_run: Mock,
+    adapter: ClaudeAgentAdapter,
+    spawn_context: SpawnContext,
+) -> None:
+    """Test spawn_many spawns every request and preserves order."""
+    mock_run.return_value = MagicMock(returncode=0)
+    mock_popen.return_value = MagicMock()
+
+    results = adapter.spawn_many(
+        [
+            ("grunt", "DBC-123", spawn_context),
+            ("pikasso", "DBC-124", spawn_context),
+            ("grunt", "DBC-125", spawn_context),
+        ],
+        model="claude-opus-4",
+    )
+
+    assert [(r.agent, r.ticket_id) for r in results] == [
+        ("grunt", "DBC-123"),
+        ("pikasso", "DBC-124"),
+        ("grunt", "DBC-125"),
+    ]
+    assert all(r.model == "claude-opus-4" for r in results)
+    assert mock_popen.call_count == 3
+
+
+@patch("herd_agent_claude.adapter.subprocess.run")
+@patch("herd_agent_claude.adapter.subprocess.Popen")
+@patch("herd_agent_claude.adapter.shutil.rmtree")
+def test_spawn_many_raises_after_all_spawns_finish(
+    mock_rmtree: Mock,
+    mock_popen: Mock,
+    mock_run: Mock,
+    adapter: ClaudeAgentAdapter,
+    spawn_context: SpawnContext,
+) -> None:
+    """Test spawn_many surfaces a failure and stops the agents that started."""
+    mock_run.return_value = MagicMock(returncode=0)
+    started = MagicMock()
+    started.poll.return_value = None
+
+    def popen(*args: object, **kwargs: dict) -> MagicMock:
+        if kwargs["env"]["HERD_AGENT_NAME"] == "pikasso":
+            raise OSError("fail")
+        return started
+
+    mock_popen.side_effect = popen
+
+    with pytest.raises(RuntimeError, match="Failed to spawn Claude process"):
+        adapter.spawn_many(
+            [
+                ("grunt", "DBC-123", spawn_context),
+                ("pikasso", "DBC-124", spawn_context),
+            ]
+        )
+
+    started.terminate.assert_called_once()
+    mock_rmtree.assert_called_once()
+    commands = [c[0][0] for c in mock_run.call_args_list]
+    assert ["git", "branch", "-d", "herd/grunt/dbc-123-agent-spawn"] in commands
+    assert ["git", "branch", "-d", "herd/pikasso/dbc-124-agent-spawn"] in commands
+    assert adapter._instances == {}
+    assert adapter._taken == set()
 
 
 @patch("herd_agent_claude.adapter.subprocess.run")
 @patch("herd_agent_claude.adapter.subprocess.Popen")
-@patch("herd_agent_claude.adapter.os.unlink")
 def test_get_status_returns_running_agent(
-    mock_unlink: Mock,
     mock_popen: Mock,
     mock_run: Mock,
     adapter: ClaudeAgentAdapter,
@@ -189,9 +577,32 @@ def test_get_status_returns_running_agent(
 
 @patch("herd_agent_claude.adapter.subprocess.run")
 @patch("herd_agent_claude.adapter.subprocess.Popen")
-@patch("herd_agent_claude.adapter.os.unlink")
+def test_process_handle_is_not_patched_onto_record(
+    mock_popen: Mock,
+    mock_run: Mock,
+    adapter: ClaudeAgentAdapter,
+    spawn_context: SpawnContext,
+) -> None:
+    """Test the process handle lives in adapter bookkeeping, not AgentRecord."""
+    mock_run.return_value = MagicMock(returncode=0)
+    mock_process = MagicMock()
+    mock_process.poll.return_value = None
+    mock_popen.return_value = mock_process
+
+    result = adapter.spawn("grunt", "DBC-123", spawn_context)
+    status = adapter.get_status(result.instance_id)
+
+    assert not hasattr(status, "_process")
+    assert not hasattr(status, "_pidfd")
+    tracked = adapter._instances[result.instance_id]
+    assert tracked.record is status
+    assert tracked.process is mock_process
+    assert tracked.pidfd is None
+
+
+@patch("herd_agent_claude.adapter.subprocess.run")
+@patch("herd_agent_claude.adapter.subprocess.Popen")
 def test_get_status_detects_completed(
-    mock_unlink: Mock,
     mock_popen: Mock,
     mock_run: Mock,
     adapter: ClaudeAgentAdapter,
@@ -212,9 +623,29 @@ def test_get_status_detects_completed(
 
 @patch("herd_agent_claude.adapter.subprocess.run")
 @patch("herd_agent_claude.adapter.subprocess.Popen")
-@patch("herd_agent_claude.adapter.os.unlink")
+def test_get_status_stamps_end_once(
+    mock_popen: Mock,
+    mock_run: Mock,
+    adapter: ClaudeAgentAdapter,
+    spawn_context: SpawnContext,
+) -> None:
+    """Test get_status stops polling and re-stamping once an agent ended."""
+    mock_run.return_value = MagicMock(returncode=0)
+    mock_process = MagicMock()
+    mock_process.poll.return_value = 0
+    mock_popen.return_value = mock_process
+
+    result = adapter.spawn("grunt", "DBC-123", spawn_context)
+    ended_at = adapter.get_status(result.instance_id).ended_at
+    status = adapter.get_status(result.instance_id)
+
+    assert status.ended_at == ended_at
+    mock_process.poll.assert_called_once()
+
+
+@patch("herd_agent_claude.adapter.subprocess.run")
+@patch("herd_agent_claude.adapter.subprocess.Popen")
 def test_get_status_detects_failed(
-    mock_unlink: Mock,
     mock_popen: Mock,
     mock_run: Mock,
     adapter: ClaudeAgentAdapter,
@@ -233,6 +664,146 @@ def test_get_status_detects_failed(
     assert status.ended_at is not None
 
 
+@pytest.mark.skipif(not hasattr(os, "pidfd_open"), reason="requires pidfd_open")
+@patch("herd_agent_claude.adapter.subprocess.run")
+def test_harvester_reports_exited_instances(
+    mock_run: Mock,
+    spawn_context: SpawnContext,
+) -> None:
+    """Test exits are harvested via pidfd and get_status reads the result."""
+    mock_run.return_value = MagicMock(returncode=0)
+    process = subprocess.Popen(
+        [sys.executable, "-c", "import sys; sys.exit(len(sys.stdin.read()) > 0)"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+    )
+
+    with patch("herd_agent_claude.adapter._HAS_PIDFD", True):
+        adapter = ClaudeAgentAdapter(repo_root="/test/repo")
+        with patch("herd_agent_claude.adapter.subprocess.Popen", return_value=process):
+            result = adapter.spawn("grunt", "DBC-123", spawn_context)
+
+    try:
+        assert adapter.poll_all(timeout=10) == {result.instance_id}
+        assert adapter.poll_all() == set()
+        with patch.object(process, "poll") as mock_poll:
+            status = adapter.get_status(result.instance_id)
+        mock_poll.assert_not_called()
+        assert status.state == AgentState.FAILED
+    finally:
+        adapter.close()
+
+
+@pytest.mark.skipif(not hasattr(os, "pidfd_open"), reason="requires pidfd_open")
+@patch("herd_agent_claude.adapter.subprocess.run")
+@patch("herd_agent_claude.adapter.shutil.rmtree")
+def test_spawn_many_rollback_keeps_harvester_alive(
+    mock_rmtree: Mock,
+    mock_run: Mock,
+    spawn_context: SpawnContext,
+) -> None:
+    """Test rolled-back agents are unwatched before they are forgotten."""
+    mock_run.return_value = MagicMock(returncode=0)
+    real_popen = subprocess.Popen
+
+    def popen(cmd: list[str], **kwargs: dict) -> subprocess.Popen[bytes]:
+        if kwargs["env"]["HERD_AGENT_NAME"] == "pikasso":
+            raise OSError("fail")
+        script = "import sys, time; sys.stdin.read(); time.sleep(30)"
+        if kwargs["env"]["HERD_AGENT_NAME"] == "quick":
+            script = "import sys; sys.stdin.read()"
+        # The mocked git never created the worktree to run in
+        return real_popen([sys.executable, "-c", script], **dict(kwargs, cwd=None))
+
+    with (
+        patch("herd_agent_claude.adapter._HAS_PIDFD", True),
+        patch("herd_agent_claude.adapter.subprocess.Popen", side_effect=popen),
+    ):
+        adapter = ClaudeAgentAdapter(repo_root="/test/repo")
+        try:
+            with pytest.raises(RuntimeError, match="Failed to spawn"):
+                adapter.spawn_many(
+                    [
+                        ("grunt", "DBC-123", spawn_context),
+                        ("pikasso", "DBC-124", spawn_context),
+                    ]
+                )
+            assert adapter._pidfd_owners == {}
+
+            result = adapter.spawn("quick", "DBC-125", spawn_context)
+            assert adapter.poll_all(timeout=10) == {result.instance_id}
+            assert adapter.get_status(result.instance_id).state == (
+                AgentState.COMPLETED
+            )
+        finally:
+            adapter.close()
+
+
+@pytest.mark.skipif(not hasattr(os, "pidfd_open"), reason="requires pidfd_open")
+@patch("herd_agent_claude.adapter.subprocess.run")
+def test_harvester_skips_forgotten_instances(
+    mock_run: Mock,
+    spawn_context: SpawnContext,
+) -> None:
+    """Test a pidfd whose instance is gone neither kills nor stalls the harvester."""
+    mock_run.return_value = MagicMock(returncode=0)
+    orphan = subprocess.Popen([sys.executable, "-c", "pass"])
+    process = subprocess.Popen(
+        [sys.executable, "-c", "import sys; sys.stdin.read()"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+    )
+
+    with patch("herd_agent_claude.adapter._HAS_PIDFD", True):
+        adapter = ClaudeAgentAdapter(repo_root="/test/repo")
+        try:
+            adapter._watch_exit("forgotten", _Tracked(MagicMock(), orphan))
+            orphan.wait()
+            # Let the harvester drop the orphan before a real exit arrives
+            deadline = time.monotonic() + 10
+            while adapter._pidfd_owners:
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+            with patch(
+                "herd_agent_claude.adapter.subprocess.Popen", return_value=process
+            ):
+                result = adapter.spawn("grunt", "DBC-123", spawn_context)
+
+            assert adapter.poll_all(timeout=10) == {result.instance_id}
+            assert adapter._harvester.is_alive()
+        finally:
+            adapter.close()
+
+
+@pytest.mark.skipif(not hasattr(os, "pidfd_open"), reason="requires pidfd_open")
+@patch("herd_agent_claude.adapter.subprocess.run")
+def test_get_status_polls_when_harvester_is_gone(
+    mock_run: Mock,
+    spawn_context: SpawnContext,
+) -> None:
+    """Test get_status falls back to process.poll() without a live harvester."""
+    mock_run.return_value = MagicMock(returncode=0)
+    process = subprocess.Popen(
+        [sys.executable, "-c", "import sys; sys.stdin.read()"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+    )
+
+    with patch("herd_agent_claude.adapter._HAS_PIDFD", True):
+        adapter = ClaudeAgentAdapter(repo_root="/test/repo")
+        with patch("herd_agent_claude.adapter.subprocess.Popen", return_value=process):
+            result = adapter.spawn("grunt", "DBC-123", spawn_context)
+
+    try:
+        # Stand in for a harvester that died before seeing the exit
+        os.write(adapter._harvest_wake[1], b"\0")
+        adapter._harvester.join()
+        process.wait(timeout=10)
+        assert adapter.get_status(result.instance_id).state == AgentState.COMPLETED
+    finally:
+        adapter.close()
+
+
 def test_get_status_unknown_instance(adapter: ClaudeAgentAdapter) -> None:
     """Test get_status raises KeyError for unknown instance."""
     with pytest.raises(KeyError, match="Instance .* not found"):
@@ -241,9 +812,9 @@ def test_get_status_unknown_instance(adapter: ClaudeAgentAdapter) -> None:
 
 @patch("herd_agent_claude.adapter.subprocess.run")
 @patch("herd_agent_claude.adapter.subprocess.Popen")
-@patch("herd_agent_claude.adapter.os.unlink")
+@patch("herd_agent_claude.adapter.shutil.rmtree")
 def test_stop_terminates_process_and_cleans_worktree(
-    mock_unlink: Mock,
+    mock_rmtree: Mock,
     mock_popen: Mock,
     mock_run: Mock,
     adapter: ClaudeAgentAdapter,
@@ -269,15 +840,10 @@ def test_stop_terminates_process_and_cleans_worktree(
     mock_process.wait.assert_called()
 
     # Verify worktree removal
-    mock_run.assert_called_once()
-    cleanup_call = mock_run.call_args
-    assert cleanup_call[0][0] == [
-        "git",
-        "worktree",
-        "remove",
-        "/private/tmp/grunt-dbc-123",
-        "--force",
-    ]
+    mock_rmtree.assert_called_once_with(
+        Path("/private/tmp/grunt-dbc-123").resolve(), ignore_errors=True
+    )
+    mock_run.assert_not_called()
 
     # Verify status update
     status = adapter.get_status(result.instance_id)
@@ -287,9 +853,9 @@ def test_stop_terminates_process_and_cleans_worktree(
 
 @patch("herd_agent_claude.adapter.subprocess.run")
 @patch("herd_agent_claude.adapter.subprocess.Popen")
-@patch("herd_agent_claude.adapter.os.unlink")
+@patch("herd_agent_claude.adapter.shutil.rmtree")
 def test_stop_kills_if_terminate_times_out(
-    mock_unlink: Mock,
+    mock_rmtree: Mock,
     mock_popen: Mock,
     mock_run: Mock,
     adapter: ClaudeAgentAdapter,
@@ -316,6 +882,186 @@ def test_stop_kills_if_terminate_times_out(
     assert mock_process.wait.call_count == 2
 
 
+@patch("herd_agent_claude.adapter.subprocess.run")
+@patch("herd_agent_claude.adapter.subprocess.Popen")
+@patch("herd_agent_claude.adapter.shutil.rmtree")
+def test_stop_many_removes_worktrees_without_git(
+    mock_rmtree: Mock,
+    mock_popen: Mock,
+    mock_run: Mock,
+    adapter: ClaudeAgentAdapter,
+    spawn_context: SpawnContext,
+) -> None:
+    """Test stop_many removes every worktree without running git."""
+    mock_run.return_value = MagicMock(returncode=0)
+    mock_process = MagicMock()
+    mock_process.poll.return_value = None
+    mock_popen.return_value = mock_process
+
+    first = adapter.spawn("grunt", "DBC-123", spawn_context)
+    second = adapter.spawn("pikasso", "DBC-124", spawn_context)
+    mock_run.reset_mock()
+
+    adapter.stop_many([first.instance_id, second.instance_id])
+
+    assert mock_rmtree.call_count == 2
+    mock_run.assert_not_called()
+    assert adapter.get_status(first.instance_id).state == AgentState.STOPPED
+    assert adapter.get_status(second.instance_id).state == AgentState.STOPPED
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="requires git")
+def test_reaper_removes_only_unlocked_adapter_worktrees(tmp_path: Path) -> None:
+    """Test the reaper drops worktree metadata but spares locks and foreign paths."""
+    repo = tmp_path / "repo"
+    root = tmp_path / "worktrees"
+
+    def git(*args: str) -> str:
+        return subprocess.run(
+            ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+            cwd=repo,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+
+    repo.mkdir()
+    git("init", "-q")
+    git("commit", "-q", "--allow-empty", "-m", "init")
+    for name in ("ours", "locked"):
+        git("worktree", "add", "-q", "--detach", str(root / name))
+    git("worktree", "lock", str(root / "locked"))
+    git("worktree", "add", "-q", "--detach", str(tmp_path / "foreign"))
+
+    reaper = _WorktreeReaper(root)
+    try:
+        assert reaper.remove(
+            [str(root / "ours"), str(root / "locked"), str(tmp_path / "foreign")]
+        ).wait(timeout=10)
+    finally:
+        reaper.close()
+
+    assert not (root / "ours").exists()
+    assert (root / "locked").exists()
+    assert (tmp_path / "foreign").exists()
+    listed = git("worktree", "list", "--porcelain")
+    assert str(root / "ours") not in listed
+    assert str(root / "locked") in listed
+    assert str(tmp_path / "foreign") in listed
+
+
+@patch("herd_agent_claude.adapter.subprocess.run")
+@patch("herd_agent_claude.adapter.subprocess.Popen")
+@patch("herd_agent_claude.adapter.shutil.rmtree")
+def test_stop_after_close_removes_worktree_inline(
+    mock_rmtree: Mock,
+    mock_popen: Mock,
+    mock_run: Mock,
+    adapter: ClaudeAgentAdapter,
+    spawn_context: SpawnContext,
+) -> None:
+    """Test close leaves agents stoppable once the reaper thread is gone."""
+    mock_run.return_value = MagicMock(returncode=0)
+    mock_process = MagicMock()
+    mock_process.poll.return_value = None
+    mock_popen.return_value = mock_process
+
+    result = adapter.spawn("grunt", "DBC-123", spawn_context)
+    adapter.close()
+    adapter.stop(result.instance_id)
+
+    mock_rmtree.assert_called_once_with(
+        Path("/private/tmp/grunt-dbc-123").resolve(), ignore_errors=True
+    )
+    assert adapter.get_status(result.instance_id).state == AgentState.STOPPED
+
+
+def test_output_reader_drains_stream_json() -> None:
+    """Test the reader drains more than a pipe buffer and parses events."""
+    script = (
+        "import json\n"
+        "for i in range(5000): print(json.dumps({'type': 'assistant', 'i': i}))\n"
+        "print('not json')\n"
+        "print(json.dumps({'type': 'result'}), end='')\n"
+    )
+    process = subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE)
+    tracked = _Tracked(MagicMock(), process)
+    reader = _OutputReader()
+    try:
+        reader.watch(tracked)
+        process.wait(timeout=10)
+        deadline = time.monotonic() + 10
+        while not process.stdout.closed and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        reader.close()
+
+    events = list(tracked.events)
+    assert len(events) == 1000
+    assert events[0] == {"type": "assistant", "i": 4001}
+    assert events[-1] == {"type": "result"}
+
+
+def test_output_reader_survives_a_failing_agent() -> None:
+    """Test one agent's bad output only unregisters that agent's pipe."""
+    script = "import json; print(json.dumps({'type': 'result'}))"
+    broken = subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE)
+    healthy = subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE)
+    bad = MagicMock(process=broken)
+    bad.feed.side_effect = RuntimeError("boom")
+    good = _Tracked(MagicMock(), healthy)
+    reader = _OutputReader()
+    try:
+        reader.watch(bad)
+        reader.watch(good)
+        deadline = time.monotonic() + 10
+        while not (broken.stdout.closed and healthy.stdout.closed):
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+    finally:
+        reader.close()
+        broken.wait()
+        healthy.wait()
+
+    assert list(good.events) == [{"type": "result"}]
+
+
+def test_output_reader_close_closes_running_pipes() -> None:
+    """Test close leaves no running agent writing into an undrained pipe."""
+    script = "import time; time.sleep(30)"
+    process = subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE)
+    reader = _OutputReader()
+    try:
+        reader.watch(_Tracked(MagicMock(), process))
+        reader.close()
+        assert process.stdout.closed
+    finally:
+        process.kill()
+        process.wait()
+
+
+@patch("herd_agent_claude.adapter.subprocess.run")
+@patch("herd_agent_claude.adapter.subprocess.Popen")
+def test_get_events_returns_parsed_output(
+    mock_popen: Mock,
+    mock_run: Mock,
+    adapter: ClaudeAgentAdapter,
+    spawn_context: SpawnContext,
+) -> None:
+    """Test get_events exposes what the reader parsed for an instance."""
+    mock_run.return_value = MagicMock(returncode=0)
+    mock_popen.return_value = MagicMock()
+
+    result = adapter.spawn("grunt", "DBC-123", spawn_context)
+    tracked = adapter._instances[result.instance_id]
+    adapter._reader.watch.assert_called_once_with(tracked)
+    tracked.feed(b'{"type": "system"}\n{"type": ')
+
+    assert adapter.get_events(result.instance_id) == [{"type": "system"}]
+    with pytest.raises(KeyError, match="Instance .* not found"):
+        adapter.get_events("unknown-instance-id")
+
+
 def test_stop_unknown_instance(adapter: ClaudeAgentAdapter) -> None:
     """Test stop raises KeyError for unknown instance."""
     with pytest.raises(KeyError, match="Instance .* not found"):
@@ -326,13 +1072,13 @@ def test_context_prompt_assembly(
     adapter: ClaudeAgentAdapter, spawn_context: SpawnContext
 ) -> None:
     """Test context prompt includes all required sections."""
-    prompt = adapter._assemble_context_prompt(
+    prompt = adapter._assemble_context_prompt_bytes(
         role="grunt",
         ticket_id="DBC-123",
         branch_name="herd/grunt/dbc-123-test",
         context=spawn_context,
         worktree_path=Path("/tmp/test"),
-    )
+    ).decode()
 
     # Verify all sections are present
     assert "You are Grunt, spawned to work on DBC-123" in prompt
@@ -357,6 +1103,51 @@ def test_context_prompt_assembly(
     assert "START WORKING NOW." in prompt
 
 
+def test_context_prompt_reuses_role_skeleton(
+    adapter: ClaudeAgentAdapter, spawn_context: SpawnContext
+) -> None:
+    """Test the role-constant part of the prompt is rendered once per role."""
+    from herd_agent_claude.adapter import _encode_role_skeleton
+
+    _encode_role_skeleton.cache_clear()
+    first = adapter._assemble_context_prompt_bytes(
+        "grunt", "DBC-123", "herd/grunt/dbc-123", spawn_context, Path("/tmp/a")
+    ).decode()
+    second = adapter._assemble_context_prompt_bytes(
+        "grunt", "DBC-124", "herd/grunt/dbc-124", spawn_context, Path("/tmp/b")
+    ).decode()
+
+    assert _encode_role_skeleton.cache_info().hits == 1
+    assert "## ASSIGNMENT: DBC-124" in second
+    assert first.endswith(second[second.index("## CRAFT STANDARDS") :])
+
+
+def test_context_prompt_bytes_match_text(
+    adapter: ClaudeAgentAdapter, spawn_context: SpawnContext
+) -> None:
+    """Test the pre-encoded stdin payload is the UTF-8 formatted template."""
+    from herd_agent_claude.adapter import _PROMPT_TEMPLATE, _render_role_skeleton
+
+    payload = adapter._assemble_context_prompt_bytes(
+        "grunt", "DBC-123", "herd/grunt/dbc-123", spawn_context, Path("/tmp/ü")
+    )
+
+    assert payload.decode("utf-8") == _PROMPT_TEMPLATE.format(
+        role_title="Grunt",
+        ticket_id="DBC-123",
+        branch_name="herd/grunt/dbc-123",
+        worktree_path="/tmp/ü",
+        role_definition=spawn_context.role_definition,
+        assignment=spawn_context.assignment,
+        env_block="export HERD_SLACK_TOKEN=xoxb-test",
+        role_skeleton=_render_role_skeleton(
+            spawn_context.craft_standards,
+            spawn_context.project_guidelines,
+            ("python", "testing"),
+        ),
+    )
+
+
 def test_context_prompt_without_skills(adapter: ClaudeAgentAdapter) -> None:
     """Test context prompt works without skills."""
     context = SpawnContext(
@@ -368,12 +1159,12 @@ def test_context_prompt_without_skills(adapter: ClaudeAgentAdapter) -> None:
         skills=[],
     )
 
-    prompt = adapter._assemble_context_prompt(
+    prompt = adapter._assemble_context_prompt_bytes(
         role="grunt",
         ticket_id="DBC-123",
         branch_name="test",
         context=context,
         worktree_path=Path("/tmp"),
-    )
+    ).decode()
 
     assert "## SKILLS" not in prompt